@@ -6,21 +6,18 @@ a complete interview generation pipeline.
 """
 
 import os
-import dspy
 from dotenv import load_dotenv
-from interview_generator import InterviewPipeline, CompleteInterviewGenerator
-
-load_dotenv()
+from interview_generator import InterviewPipeline, CompleteInterviewGenerator, configure_lm
 
 
 def setup_dspy():
     """Initialize DSPy."""
+    load_dotenv()
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("Please set OPENAI_API_KEY in your .env file")
 
-    lm = dspy.LM('openai/gpt-4o-mini', api_key=api_key)
-    dspy.configure(lm=lm)
+    configure_lm(api_key=api_key)
     print("✓ DSPy configured\n")
 
 
@@ -56,36 +53,38 @@ def generate_specialized_questions():
 
     generator = CompleteInterviewGenerator()
 
-    # Generate coding question
+    # The three questions are independent, so batch() generates them
+    # concurrently: all main questions at once, then all follow-ups
+    coding_result, ml_theory_result, ml_practical_result = generator.batch([
+        {
+            'topic': "graph algorithms - shortest path",
+            'question_type': "coding",
+            'difficulty': "medium",
+            'num_followups': 2
+        },
+        {
+            'topic': "bias-variance tradeoff",
+            'question_type': "ml_theory",
+            'difficulty': "medium",
+            'num_followups': 2
+        },
+        {
+            'topic': "model evaluation and cross-validation",
+            'question_type': "ml_practical",
+            'difficulty': "hard",
+            'num_followups': 2
+        }
+    ], max_concurrency=3)
+
     print("\n--- CODING QUESTION ---")
-    coding_result = generator(
-        topic="graph algorithms - shortest path",
-        question_type="coding",
-        difficulty="medium",
-        num_followups=2
-    )
     print(f"\n{coding_result['question']}\n")
     print(f"Follow-ups:\n{coding_result['followup_questions']}\n")
 
-    # Generate ML theoretical question
     print("\n--- ML THEORY QUESTION ---")
-    ml_theory_result = generator(
-        topic="bias-variance tradeoff",
-        question_type="ml_theory",
-        difficulty="medium",
-        num_followups=2
-    )
     print(f"\n{ml_theory_result['question']}\n")
     print(f"Follow-ups:\n{ml_theory_result['followup_questions']}\n")
 
-    # Generate ML practical question
     print("\n--- ML PRACTICAL QUESTION ---")
-    ml_practical_result = generator(
-        topic="model evaluation and cross-validation",
-        question_type="ml_practical",
-        difficulty="hard",
-        num_followups=2
-    )
     print(f"\n{ml_practical_result['question']}\n")
     print(f"Follow-ups:\n{ml_practical_result['followup_questions']}\n")
 
@@ -5,91 +5,113 @@ This example demonstrates the fundamentals of using DSPy to generate
 technical interview questions.
 """
 
+import asyncio
+import io
 import os
-import dspy
+import sys
 from dotenv import load_dotenv
-from interview_generator import QuestionGenerator, FollowUpGenerator
+from interview_generator import QuestionGenerator, FollowUpGenerator, configure_lm
 
-# Load environment variables
-load_dotenv()
 
 # Step 1: Configure DSPy with your LLM
 # DSPy supports multiple LLM providers. Here we use OpenAI.
 def setup_dspy():
     """Initialize DSPy with an LLM backend."""
+    load_dotenv()
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("Please set OPENAI_API_KEY in your .env file")
 
-    # Configure DSPy to use GPT-4 (you can also use gpt-3.5-turbo for lower cost)
-    lm = dspy.LM('openai/gpt-4o-mini', api_key=api_key)
-    dspy.configure(lm=lm)
+    # Configure DSPy to use GPT-4o-mini (pass model=... for another provider)
+    configure_lm(api_key=api_key)
     print("✓ DSPy configured with OpenAI GPT-4o-mini\n")
 
 
-def generate_simple_question():
-    """Example 1: Generate a single interview question."""
-    print("=" * 60)
-    print("Example 1: Generating a Simple Question")
-    print("=" * 60)
+async def agenerate_simple_question(out=None):
+    """Example 1: Generate a single interview question. Output goes to out (default: stdout)."""
+    if out is None:
+        out = sys.stdout
+    print("=" * 60, file=out)
+    print("Example 1: Generating a Simple Question", file=out)
+    print("=" * 60, file=out)
 
     # Create a question generator module
     generator = QuestionGenerator()
 
-    # Generate a coding question
-    result = generator(
+    # Generate a coding question (acall is the async version of calling the module)
+    result = await generator.acall(
         topic="binary search trees",
         question_type="coding",
         difficulty="medium"
     )
 
-    print(f"\nQuestion:\n{result.question}\n")
-    print(f"What it tests:\n{result.explanation}\n")
+    print(f"\nQuestion:\n{result.question}\n", file=out)
+    print(f"What it tests:\n{result.explanation}\n", file=out)
 
 
-def generate_ml_question():
-    """Example 2: Generate an ML-focused question."""
-    print("=" * 60)
-    print("Example 2: Generating an ML Question")
-    print("=" * 60)
+async def agenerate_ml_question(out=None):
+    """Example 2: Generate an ML-focused question. Output goes to out (default: stdout)."""
+    if out is None:
+        out = sys.stdout
+    print("=" * 60, file=out)
+    print("Example 2: Generating an ML Question", file=out)
+    print("=" * 60, file=out)
 
     generator = QuestionGenerator()
 
-    result = generator(
+    result = await generator.acall(
         topic="backpropagation and gradient descent",
         question_type="ml_theory",
         difficulty="medium"
     )
 
-    print(f"\nML Question:\n{result.question}\n")
-    print(f"What it tests:\n{result.explanation}\n")
+    print(f"\nML Question:\n{result.question}\n", file=out)
+    print(f"What it tests:\n{result.explanation}\n", file=out)
 
 
-def generate_with_followups():
-    """Example 3: Generate question with follow-ups."""
-    print("=" * 60)
-    print("Example 3: Question with Follow-ups")
-    print("=" * 60)
+async def agenerate_with_followups(out=None):
+    """Example 3: Generate question with follow-ups. Output goes to out (default: stdout)."""
+    if out is None:
+        out = sys.stdout
+    print("=" * 60, file=out)
+    print("Example 3: Question with Follow-ups", file=out)
+    print("=" * 60, file=out)
 
     # Generate main question
     question_gen = QuestionGenerator()
-    question_result = question_gen(
+    question_result = await question_gen.acall(
         topic="convolutional neural networks",
         question_type="ml_theory",
         difficulty="hard"
     )
 
-    print(f"\nMain Question:\n{question_result.question}\n")
+    print(f"\nMain Question:\n{question_result.question}\n", file=out)
 
-    # Generate follow-ups
+    # Generate follow-ups (this step needs the main question first)
     followup_gen = FollowUpGenerator()
-    followup_result = followup_gen(
+    followup_result = await followup_gen.acall(
         original_question=question_result.question,
         topic="convolutional neural networks",
         num_followups=3
     )
 
-    print(f"Follow-up Questions:\n{followup_result.followup_questions}\n")
+    print(f"Follow-up Questions:\n{followup_result.followup_questions}\n", file=out)
+
+
+async def run_examples():
+    """
+    Run all examples concurrently, since none depends on another.
+
+    Each example prints into its own buffer so that the output blocks
+    stay contiguous; the buffers are returned in example order.
+    """
+    buffers = [io.StringIO() for _ in range(3)]
+    await asyncio.gather(
+        agenerate_simple_question(buffers[0]),
+        agenerate_ml_question(buffers[1]),
+        agenerate_with_followups(buffers[2])
+    )
+    return [buffer.getvalue() for buffer in buffers]
 
 
 def main():
@@ -102,13 +124,8 @@ def main():
     setup_dspy()
 
     # Run examples
-    generate_simple_question()
-    print("\n")
-
-    generate_ml_question()
-    print("\n")
-
-    generate_with_followups()
+    outputs = asyncio.run(run_examples())
+    print("\n\n".join(outputs), end="")
 
     print("\n" + "=" * 60)
     print("Examples completed! Try modifying the topics and difficulty.")
@@ -1,22 +1,58 @@
 #!/usr/bin/env python3
 """
 Simple CLI tool to generate technical interview questions.
-Usage: python generate_question.py
+Usage: python generate_question.py ["topic" ...]
+       python generate_question.py --serve
+
+With --serve, the generator stays loaded in a background daemon that
+later invocations talk to over a Unix socket, skipping dspy start-up.
 """
 
+import argparse
+import asyncio
+import json
 import os
+import socket
+import socketserver
+import string
 import sys
-import dspy
+import threading
 from dotenv import load_dotenv
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from interview_generator import CompleteInterviewGenerator, InterviewPipeline
+# interview_generator is imported inside the functions that need it:
+# it pulls in dspy (and litellm), which is slow and not needed for --help
+# or when a daemon answers the request.
+
+# Per-user socket, in the user's private runtime directory when there is one
+_RUNTIME_DIR = os.environ.get("XDG_RUNTIME_DIR")
+DEFAULT_SOCKET = (
+    os.path.join(_RUNTIME_DIR, "ig.sock") if _RUNTIME_DIR
+    else f"/tmp/ig-{os.getuid()}.sock"
+)
+
+# Seconds to wait for the daemon: connecting, and answering a request
+DAEMON_PROBE_TIMEOUT = 1
+DAEMON_REQUEST_TIMEOUT = 300
+
+# Result fields sent back by the daemon ('details' is not JSON-serializable)
+DAEMON_RESULT_FIELDS = ('question', 'difficulty', 'followup_questions')
+
+# How a generated question and its follow-ups are printed in each mode
+INTERACTIVE_RESULT_TEMPLATE = (
+    "{question}\n" + "-" * 60 + "\n\nFOLLOW-UP QUESTIONS:\n{followup_questions}"
+)
+QUICK_RESULT_TEMPLATE = (
+    "=" * 60 + "\n{question}\n" + "=" * 60 + "\n\nFollow-ups:\n{followup_questions}\n\n"
+)
 
 
 def setup_dspy():
     """Setup DSPy with OpenAI."""
+    from interview_generator import configure_lm
+
     load_dotenv()
     api_key = os.getenv("OPENAI_API_KEY")
 
@@ -28,8 +64,15 @@ def setup_dspy():
         print("3. Run this script again")
         sys.exit(1)
 
-    lm = dspy.LM('openai/gpt-4o-mini', api_key=api_key)
-    dspy.configure(lm=lm)
+    configure_lm(api_key=api_key)
+
+
+def make_generator():
+    """Create the generator, caching results by exact request and by similar topic."""
+    from interview_generator import CompleteInterviewGenerator, DiskCacheBackend, SemanticCache
+
+    cache = DiskCacheBackend()
+    return CompleteInterviewGenerator(cache=cache, semantic_cache=SemanticCache(backend=cache))
 
 
 def print_banner():
@@ -70,8 +113,8 @@ def get_text_input(prompt):
             sys.exit(0)
 
 
-def generate_question_interactive():
-    """Interactive question generation."""
+def generate_question_interactive(socket_path=None):
+    """Interactive question generation (through the daemon at socket_path, if given)."""
     print_banner()
 
     # Question type
@@ -108,15 +151,15 @@ def generate_question_interactive():
     print("Generating question... (this may take a few seconds)")
     print("=" * 60 + "\n")
 
-    generator = CompleteInterviewGenerator()
-    result = generator(
-        topic=topic,
-        question_type=question_type,
-        difficulty=difficulty,
-        num_followups=num_followups
-    )
+    request = {
+        'topic': topic,
+        'question_type': question_type,
+        'difficulty': difficulty,
+        'num_followups': num_followups
+    }
+    result = request_from_daemon(socket_path, [request])[0] if socket_path else None
 
-    # Display results
+    # Display results (as they stream in, when generating locally)
     print("\n" + "=" * 60)
     print("GENERATED INTERVIEW QUESTION")
     print("=" * 60 + "\n")
@@ -124,44 +167,206 @@ def generate_question_interactive():
     print(f"Type: {question_type}")
     print(f"Difficulty: {difficulty}\n")
     print("-" * 60)
-    print(result['question'])
-    print("-" * 60)
-    print("\nFOLLOW-UP QUESTIONS:")
-    print(result['followup_questions'])
+    if result is None:
+        generator = make_generator()
+        stream_question(generator, INTERACTIVE_RESULT_TEMPLATE, **request)
+    else:
+        print(INTERACTIVE_RESULT_TEMPLATE.format_map(result))
     print("\n" + "=" * 60 + "\n")
 
 
-def generate_question_quick(topic, question_type="coding", difficulty="medium"):
-    """Quick generation without interaction."""
+def stream_question(generator, template, **request):
+    """
+    Generate one question, printing it with template as the text streams in.
+
+    template has {question} and {followup_questions} placeholders, like
+    the *_RESULT_TEMPLATE constants. Returns the complete result dict.
+    """
+    # Text printed before each section, and after the last one
+    parsed = list(string.Formatter().parse(template))
+    prefixes = {field: literal for literal, field, _, _ in parsed if field}
+    suffix = parsed[-1][0] if parsed[-1][1] is None else ""
+
+    async def run():
+        result = None
+        section = None
+        async for item in generator.astream(**request):
+            if isinstance(item, dict):
+                result = item
+                continue
+            name, text = item
+            if name != section:
+                print(prefixes[name], end="", flush=True)
+                section = name
+            print(text, end="", flush=True)
+        print(suffix)
+        return result
+
+    return asyncio.run(run())
+
+
+def generate_question_quick(topics, question_type="coding", difficulty="medium", socket_path=None):
+    """Quick generation without interaction, one question per topic."""
     print_banner()
-    print(f"Generating {difficulty} {question_type} question on: {topic}\n")
-
-    generator = CompleteInterviewGenerator()
-    result = generator(
-        topic=topic,
-        question_type=question_type,
-        difficulty=difficulty,
-        num_followups=2
-    )
+    print(f"Generating {difficulty} {question_type} question on: {', '.join(topics)}\n")
+
+    requests = [
+        {
+            'topic': topic,
+            'question_type': question_type,
+            'difficulty': difficulty,
+            'num_followups': 2
+        }
+        for topic in topics
+    ]
+
+    if socket_path:
+        results = request_from_daemon(socket_path, requests)
+    else:
+        generator = make_generator()
+
+        # A single question is streamed; several are generated concurrently
+        if len(topics) == 1:
+            stream_question(generator, QUICK_RESULT_TEMPLATE, **requests[0])
+            return
+
+        results = generator.batch(requests)
+
+    for topic, result in zip(topics, results):
+        if len(topics) > 1:
+            print(f"Topic: {topic}")
+        print(QUICK_RESULT_TEMPLATE.format_map(result))
 
-    print("=" * 60)
-    print(result['question'])
-    print("=" * 60)
-    print("\nFollow-ups:")
-    print(result['followup_questions'])
-    print("\n")
+
+def serve(socket_path):
+    """
+    Run a daemon that keeps the generator loaded and answers requests on socket_path.
+
+    All requests run on one long-lived event loop with a shared async HTTP
+    client, so connections to the provider stay warm between requests.
+    """
+    from interview_generator import configure_async_http_client
+
+    if daemon_available(socket_path):
+        print(f"Error: a daemon is already serving on {socket_path}")
+        sys.exit(1)
+
+    setup_dspy()
+    generator = make_generator()
+
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    http_client = configure_async_http_client()
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        """Reads one JSON line {"requests": [...]} and replies with {"results": [...]}."""
+
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                # Availability probe from daemon_available()
+                return
+            try:
+                results = asyncio.run_coroutine_threadsafe(
+                    generator.abatch(json.loads(line)['requests']), loop
+                ).result()
+                response = {'results': [
+                    {field: result[field] for field in DAEMON_RESULT_FIELDS}
+                    for result in results
+                ]}
+            except Exception as e:
+                response = {'error': str(e)}
+            self.wfile.write(json.dumps(response).encode('utf-8') + b"\n")
+
+    # Remove a socket left behind by a daemon that did not shut down cleanly
+    if os.path.exists(socket_path):
+        if os.stat(socket_path).st_uid != os.getuid():
+            print(f"Error: {socket_path} belongs to another user")
+            sys.exit(1)
+        os.unlink(socket_path)
+
+    with socketserver.ThreadingUnixStreamServer(socket_path, RequestHandler) as server:
+        # Only this user may send requests (and spend their API key)
+        os.chmod(socket_path, 0o600)
+        print(f"Serving on {socket_path} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nStopping...")
+        finally:
+            os.unlink(socket_path)
+            asyncio.run_coroutine_threadsafe(http_client.aclose(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+
+def daemon_available(socket_path):
+    """Check whether a daemon owned by this user is listening on socket_path."""
+    if not os.path.exists(socket_path):
+        return False
+    # Never talk to (or replace) a socket someone else created
+    if os.stat(socket_path).st_uid != os.getuid():
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(DAEMON_PROBE_TIMEOUT)
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+def request_from_daemon(socket_path, requests):
+    """Send generation requests to the daemon and return its results."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(DAEMON_REQUEST_TIMEOUT)
+            sock.connect(socket_path)
+            sock.sendall(json.dumps({'requests': requests}).encode('utf-8') + b"\n")
+            response = json.loads(sock.makefile('rb').readline())
+    except socket.timeout:
+        print(f"Error: the daemon on {socket_path} did not answer within {DAEMON_REQUEST_TIMEOUT}s")
+        sys.exit(1)
+
+    if 'error' in response:
+        print(f"Error from daemon: {response['error']}")
+        sys.exit(1)
+    return response['results']
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Generate technical interview questions. With no topic, "
+                    "asks interactively for the question type, topic, difficulty "
+                    "and number of follow-ups. With one or more topics, generates "
+                    "a medium coding question with 2 follow-ups for each."
+    )
+    parser.add_argument("topics", nargs="*", help="topics to generate questions on")
+    parser.add_argument("--serve", action="store_true",
+                        help="run as a daemon that later invocations reuse")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET,
+                        help=f"Unix socket of the daemon (default: {DEFAULT_SOCKET})")
+    return parser.parse_args()
 
 
 def main():
     """Main entry point."""
-    setup_dspy()
+    args = parse_args()
+
+    if args.serve:
+        serve(args.socket)
+        return
+
+    # Use a running daemon if there is one, otherwise generate in-process
+    socket_path = args.socket if daemon_available(args.socket) else None
+    if socket_path is None:
+        setup_dspy()
 
-    # Check if arguments provided
-    if len(sys.argv) > 1:
-        topic = " ".join(sys.argv[1:])
-        generate_question_quick(topic)
+    # Check if topics provided
+    if args.topics:
+        generate_question_quick(args.topics, socket_path=socket_path)
     else:
-        generate_question_interactive()
+        generate_question_interactive(socket_path=socket_path)
 
 
 if __name__ == "__main__":
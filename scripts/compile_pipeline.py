@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Compile CompleteInterviewGenerator with DSPy's MIPROv2 optimizer.
+
+MIPROv2 makes many exploratory LLM calls, so it is run once, offline, and
+the optimized program is saved to compiled_pipeline.json. The generator
+loads that file on start-up. The file records a hash of the dev set,
+the optimizer config and SIG_VERSION; compiling again with the same
+inputs is skipped unless --recompile is given.
+
+Usage: python scripts/compile_pipeline.py [--recompile]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+import dspy
+from dotenv import load_dotenv
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from interview_generator import CompleteInterviewGenerator, configure_lm
+from interview_generator.modules import COMPILED_PROGRAM_PATH
+from interview_generator.signatures import SIG_VERSION
+
+OPTIMIZER_CONFIG = {
+    'model': 'openai/gpt-4o-mini',
+    'auto': 'light',
+    'max_bootstrapped_demos': 2,
+    'max_labeled_demos': 0
+}
+
+# (topic, question_type, difficulty) requests the program is optimized on
+DEVSET_REQUESTS = [
+    ("binary search trees", "coding", "medium"),
+    ("dynamic programming", "coding", "hard"),
+    ("two pointers", "coding", "easy"),
+    ("graph shortest paths", "coding", "medium"),
+    ("tries", "coding", "hard"),
+    ("hash maps", "coding", "easy"),
+    ("bias-variance tradeoff", "ml_theory", "medium"),
+    ("backpropagation", "ml_theory", "hard"),
+    ("regularization", "ml_theory", "easy"),
+    ("attention mechanisms", "ml_theory", "hard"),
+    ("cross-validation", "ml_practical", "medium"),
+    ("class imbalance", "ml_practical", "medium"),
+    ("feature scaling", "ml_practical", "easy"),
+    ("model deployment and monitoring", "ml_practical", "hard"),
+]
+
+
+class JudgeInterviewQuestion(dspy.Signature):
+    """Judge how good a generated technical interview question and its follow-ups are.
+
+    A good question is on-topic, clearly stated, answerable in an interview,
+    matches the requested difficulty, and its follow-ups dig deeper into it.
+    """
+
+    topic: str = dspy.InputField(desc="Requested topic")
+    question_type: str = dspy.InputField(desc="'coding', 'ml_theory' or 'ml_practical'")
+    difficulty: str = dspy.InputField(desc="Requested difficulty")
+    question: str = dspy.InputField(desc="Generated question")
+    followup_questions: str = dspy.InputField(desc="Generated follow-up questions")
+
+    score: float = dspy.OutputField(desc="Quality from 0.0 (unusable) to 1.0 (excellent)")
+
+
+judge = dspy.ChainOfThought(JudgeInterviewQuestion)
+
+
+def metric(example, pred, trace=None) -> float:
+    """LLM-as-judge score of a generated question set."""
+    result = judge(
+        topic=example.topic,
+        question_type=example.question_type,
+        difficulty=example.difficulty,
+        question=pred['question'],
+        followup_questions=pred['followup_questions']
+    )
+    score = min(max(float(result.score), 0.0), 1.0)
+    # While bootstrapping demos, only keep clearly good traces
+    return score >= 0.8 if trace is not None else score
+
+
+def build_devset():
+    """Dev set of generation requests as dspy.Examples."""
+    return [
+        dspy.Example(
+            topic=topic,
+            question_type=question_type,
+            difficulty=difficulty,
+            num_followups=2
+        ).with_inputs('topic', 'question_type', 'difficulty', 'num_followups')
+        for topic, question_type, difficulty in DEVSET_REQUESTS
+    ]
+
+
+def compile_key():
+    """Hash of everything the compiled program depends on."""
+    payload = json.dumps({
+        'devset': DEVSET_REQUESTS,
+        'config': OPTIMIZER_CONFIG,
+        'sig_version': SIG_VERSION
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def saved_compile_key(path):
+    """compile_key() of the program saved at path, or None."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f).get('compile_meta', {}).get('compile_key')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimize the interview generator with MIPROv2.")
+    parser.add_argument("--recompile", action="store_true",
+                        help="compile even if an up-to-date compiled program exists")
+    parser.add_argument("--output", default=COMPILED_PROGRAM_PATH,
+                        help=f"where to save the compiled program (default: {COMPILED_PROGRAM_PATH})")
+    args = parser.parse_args()
+
+    key = compile_key()
+    if not args.recompile and saved_compile_key(args.output) == key:
+        print(f"{args.output} is up to date (use --recompile to compile anyway)")
+        return
+
+    load_dotenv()
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        print("Error: OPENAI_API_KEY not found!")
+        sys.exit(1)
+    configure_lm(model=OPTIMIZER_CONFIG['model'], api_key=api_key)
+
+    # Start from the unoptimized program, not a previously compiled one
+    program = CompleteInterviewGenerator(compiled_path=None)
+    optimizer = dspy.MIPROv2(
+        metric=metric,
+        auto=OPTIMIZER_CONFIG['auto'],
+        max_bootstrapped_demos=OPTIMIZER_CONFIG['max_bootstrapped_demos'],
+        max_labeled_demos=OPTIMIZER_CONFIG['max_labeled_demos']
+    )
+    compiled = optimizer.compile(program, trainset=build_devset(), minibatch=False)
+    compiled.save(args.output)
+
+    # Record what the program was compiled from; dspy ignores the extra key on load
+    with open(args.output) as f:
+        state = json.load(f)
+    state['compile_meta'] = {'compile_key': key, 'sig_version': SIG_VERSION}
+    with open(args.output, 'w') as f:
+        json.dump(state, f, indent=2)
+
+    print(f"Saved compiled program to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
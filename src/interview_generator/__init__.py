@@ -1,30 +1,45 @@
 """
 Tech Interview Generator using DSPy
 A framework for generating technical interview questions using DSPy's declarative approach
+
+Exports are loaded lazily (PEP 562): importing the package is cheap, and
+dspy is only imported once one of its symbols is first used.
 """
 
-from .signatures import (
-    GenerateQuestion,
-    GenerateFollowUp,
-    AssessDifficulty
-)
-from .modules import (
-    QuestionGenerator,
-    FollowUpGenerator,
-    InterviewPipeline,
-    CompleteInterviewGenerator,
-    CodingQuestionGenerator,
-    MLQuestionGenerator
-)
-
-__all__ = [
-    'GenerateQuestion',
-    'GenerateFollowUp',
-    'AssessDifficulty',
-    'QuestionGenerator',
-    'FollowUpGenerator',
-    'InterviewPipeline',
-    'CompleteInterviewGenerator',
-    'CodingQuestionGenerator',
-    'MLQuestionGenerator'
-]
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'GenerateQuestion': '.signatures',
+    'GenerateFollowUp': '.signatures',
+    'GenerateQuestionWithFollowUps': '.signatures',
+    'AssessDifficulty': '.signatures',
+    'QuestionGenerator': '.modules',
+    'FollowUpGenerator': '.modules',
+    'InterviewPipeline': '.modules',
+    'CompleteInterviewGenerator': '.modules',
+    'CodingQuestionGenerator': '.modules',
+    'MLQuestionGenerator': '.modules',
+    'configure_lm': '.config',
+    'configure_async_http_client': '.config',
+    'PrecompiledChatAdapter': '.config',
+    'DiskCacheBackend': '.cache',
+    'SemanticCache': '.cache',
+    'batch_offline': '.offline',
+    'collect': '.offline'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Import an exported symbol from its submodule on first access."""
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,166 @@
+"""
+Result Caching for Tech Interview Generation
+
+Generating one question takes several LLM calls. Finished results are
+stored on disk, keyed by the exact request, so repeating a request
+(even across CLI invocations) returns instantly and costs no tokens.
+SemanticCache extends this to topics that are worded differently but
+mean the same thing.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+import diskcache
+import numpy as np
+
+from .signatures import SIG_VERSION
+
+DEFAULT_CACHE_DIR = ".ig_cache"
+DEFAULT_EMBEDDING_MODEL = "openai/text-embedding-3-small"
+
+
+def _hash(payload: Dict) -> str:
+    """Stable sha256 hex digest of a JSON-serializable dict."""
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def make_key(topic: str, question_type: str, difficulty: str, num_followups: int,
+             compile_key: Optional[str] = None, model: Optional[str] = None) -> str:
+    """
+    Build the exact-match cache key for a generation request.
+
+    compile_key identifies the compiled program that generates the result
+    (None for the plain modules) and model the LM, so results from before
+    a recompile or from another model are not served.
+    """
+    return _hash({
+        "topic": topic,
+        "type": question_type,
+        "difficulty": difficulty,
+        "num_followups": num_followups,
+        "sig_version": SIG_VERSION,
+        "compile_key": compile_key,
+        "model": model
+    })
+
+
+class DiskCacheBackend:
+    """Persistent key/value store backed by diskcache."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self._cache = diskcache.Cache(directory)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss."""
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Any):
+        """Store a value under key."""
+        self._cache.set(key, value)
+
+    def transact(self):
+        """
+        Context manager that makes the gets and sets inside it atomic, even
+        across threads and processes sharing the directory.
+        """
+        return self._cache.transact()
+
+
+class SemanticCache:
+    """
+    Matches requests whose topics are near-duplicates ('binary tree',
+    'binary trees', 'BSTs').
+
+    Each topic is embedded once. A request matches a cached one with the
+    same question type, difficulty and number of follow-ups when the
+    cosine similarity of their topic embeddings exceeds threshold. Only an
+    embedding index is kept here; the results themselves stay in the
+    exact-match cache, and lookups return their exact-match keys.
+    """
+
+    def __init__(self, threshold: float = 0.92, backend: Optional[DiskCacheBackend] = None,
+                 embedder=None):
+        import dspy
+
+        self.threshold = threshold
+        self.backend = backend if backend is not None else DiskCacheBackend()
+        self.embedder = embedder if embedder is not None else dspy.Embedder(DEFAULT_EMBEDDING_MODEL)
+
+    @staticmethod
+    def _index_key(request: Dict, compile_key: Optional[str], model: Optional[str]) -> str:
+        """Key of the embedding index for a request's (type, difficulty, num_followups) group."""
+        return "semantic-index:" + _hash({
+            "type": request['question_type'],
+            "difficulty": request['difficulty'],
+            "num_followups": request.get('num_followups', 3),
+            "sig_version": SIG_VERSION,
+            "compile_key": compile_key,
+            "model": model
+        })
+
+    def _embed(self, requests: List[Dict]) -> np.ndarray:
+        """Unit-length embeddings of the requests' normalized topics, in one embedder call."""
+        topics = [" ".join(r['topic'].lower().split()) for r in requests]
+        embeddings = np.asarray(self.embedder(topics), dtype=np.float32)
+        return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    def lookup(self, requests: List[Dict], compile_key: Optional[str] = None,
+               model: Optional[str] = None) -> List[Optional[str]]:
+        """
+        For each request, return the exact-match key of a similar cached request, or None.
+
+        Only requests indexed with the same compile_key and model (see
+        make_key()) match.
+        Topics are only embedded for requests whose group has an index, and
+        an embedder failure counts as a miss.
+        """
+        matches = [None] * len(requests)
+        indexes = [self.backend.get(self._index_key(r, compile_key, model)) for r in requests]
+        candidates = [i for i, index in enumerate(indexes) if index is not None]
+        if not candidates:
+            return matches
+
+        try:
+            embeddings = self._embed([requests[i] for i in candidates])
+        except Exception:
+            # Without embeddings there are no semantic hits; generate instead
+            return matches
+
+        for i, embedding in zip(candidates, embeddings):
+            similarities = indexes[i]['embeddings'] @ embedding
+            best = int(np.argmax(similarities))
+            if similarities[best] > self.threshold:
+                matches[i] = indexes[i]['keys'][best]
+        return matches
+
+    def add(self, requests: List[Dict], keys: List[str], compile_key: Optional[str] = None,
+            model: Optional[str] = None):
+        """
+        Index requests whose results were stored under the given exact-match keys.
+
+        If the embedder fails, the requests are left unindexed; their exact
+        matches are still cached.
+        """
+        if not requests:
+            return
+
+        try:
+            embeddings = self._embed(requests)
+        except Exception:
+            return
+
+        for request, key, embedding in zip(requests, keys, embeddings):
+            index_key = self._index_key(request, compile_key, model)
+            # Concurrent adds (e.g. daemon threads) must not overwrite each other's entries
+            with self.backend.transact():
+                index = self.backend.get(index_key)
+                if index is None:
+                    index = {'keys': [key], 'embeddings': embedding[np.newaxis, :]}
+                else:
+                    index = {
+                        'keys': index['keys'] + [key],
+                        'embeddings': np.vstack([index['embeddings'], embedding])
+                    }
+                self.backend.set(index_key, index)
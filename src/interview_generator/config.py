@@ -0,0 +1,129 @@
+"""
+LM Configuration for Tech Interview Generation
+
+Centralizes how DSPy's language model is set up so that every entry
+point (CLI, examples) gets the same caching and connection pooling.
+"""
+
+import atexit
+import weakref
+from typing import Optional
+
+import dspy
+import httpx
+import litellm
+
+DEFAULT_MODEL = 'openai/gpt-4o-mini'
+
+# Keep-alive pool for the HTTP clients shared by LiteLLM calls
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, keepalive_expiry=60)
+
+# Ask LiteLLM to mark the system message as cacheable. DSPy renders the
+# signature instructions and field descriptions into the system message,
+# so this static prefix is shared by every call to the same module.
+CACHE_CONTROL_INJECTION_POINTS = [{"location": "message", "role": "system"}]
+
+
+class PrecompiledChatAdapter(dspy.ChatAdapter):
+    """
+    ChatAdapter that renders the static parts of a prompt once per signature.
+
+    The system message (instructions, field descriptions and structure) and
+    the output-format reminder only depend on the signature, so they are
+    built on first use and reused; each call only formats its input values.
+    DSPy 2.6 assembles the system message from the three format_* parts
+    itself, newer versions through format_system_message, so both levels
+    are memoized.
+
+    Optimizers replace a predictor's signature with a new class rather
+    than modifying it, so a cached rendering never goes stale. Renderings
+    are held weakly, so the candidate signatures an optimizer discards
+    are freed along with them.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._rendered = weakref.WeakKeyDictionary()
+
+    def _memoized(self, part: str, signature, render) -> str:
+        """Return render(signature), computing it only on the first call per part and signature."""
+        parts = self._rendered.setdefault(signature, {})
+        if part not in parts:
+            parts[part] = render(signature)
+        return parts[part]
+
+    def format_system_message(self, signature) -> str:
+        return self._memoized('system_message', signature, super().format_system_message)
+
+    def format_field_description(self, signature) -> str:
+        return self._memoized('field_description', signature, super().format_field_description)
+
+    def format_field_structure(self, signature) -> str:
+        return self._memoized('field_structure', signature, super().format_field_structure)
+
+    def format_task_description(self, signature) -> str:
+        return self._memoized('task_description', signature, super().format_task_description)
+
+    def user_message_output_requirements(self, signature) -> str:
+        return self._memoized('output_requirements', signature, super().user_message_output_requirements)
+
+
+def _configure_http_client():
+    """
+    Give LiteLLM one pooled HTTP/2 client for synchronous calls, so
+    connections (and their TLS handshakes) to the provider are reused
+    across calls and modules.
+
+    This serves the synchronous paths: InterviewPipeline.forward(),
+    CompleteInterviewGenerator.forward() and compilation with MIPROv2,
+    which calls forward() for every trial.
+    """
+    if litellm.client_session is None:
+        litellm.client_session = httpx.Client(http2=True, limits=HTTP_LIMITS)
+        atexit.register(litellm.client_session.close)
+
+
+def configure_async_http_client() -> httpx.AsyncClient:
+    """
+    Give LiteLLM one pooled HTTP/2 client for asynchronous calls.
+
+    An httpx.AsyncClient is tied to the event loop that first uses it, so
+    only call this in a process where a single long-lived loop runs every
+    async LLM call, like the CLI daemon. batch() and astream() start a
+    fresh loop per call and keep using LiteLLM's own per-loop clients.
+
+    Returns:
+        The client; close it with `await client.aclose()` on that loop
+    """
+    litellm.aclient_session = httpx.AsyncClient(http2=True, limits=HTTP_LIMITS)
+    return litellm.aclient_session
+
+
+def configure_lm(model: str = DEFAULT_MODEL, api_key: Optional[str] = None,
+                 cache_dir: Optional[str] = None):
+    """
+    Configure DSPy with an LM that uses provider-side prompt caching,
+    and a PrecompiledChatAdapter to render its prompts.
+
+    Args:
+        model: LiteLLM model name, e.g. 'openai/gpt-4o-mini'
+        api_key: API key for the provider (falls back to the environment)
+        cache_dir: Directory for DSPy's on-disk response cache. Identical
+            requests are answered from here without calling the LLM.
+            Uses DSPy's default location when not given.
+
+    Returns:
+        The configured dspy.LM
+    """
+    _configure_http_client()
+    if cache_dir is not None:
+        dspy.configure_cache(enable_disk_cache=True, disk_cache_dir=cache_dir)
+
+    lm = dspy.LM(
+        model,
+        api_key=api_key,
+        cache=True,
+        cache_control_injection_points=CACHE_CONTROL_INJECTION_POINTS
+    )
+    dspy.configure(lm=lm, adapter=PrecompiledChatAdapter())
+    return lm
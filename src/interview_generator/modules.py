@@ -3,18 +3,57 @@ DSPy Modules for Tech Interview Generation
 
 Modules in DSPy are composable building blocks that use signatures
 and prompting techniques to solve tasks.
+
+The ChainOfThought predictors are built once per process and shared by
+every module instance, so creating a pipeline is cheap. As a consequence,
+modifying one instance's predictors affects all of them; an instance that
+loads a compiled program copies its predictors first.
 """
 
+import asyncio
+import collections
+import functools
+import json
+import os
+import string
 import dspy
-from typing import List, Dict
+from typing import List, Dict, Optional
+from .cache import DiskCacheBackend, SemanticCache, make_key
 from .signatures import (
     GenerateQuestion,
     GenerateFollowUp,
+    GenerateQuestionWithFollowUps,
     AssessDifficulty,
     GenerateCodingQuestion,
-    GenerateMLQuestion
+    GenerateMLQuestion,
+    SIG_VERSION
+)
+
+# Program optimized offline by scripts/compile_pipeline.py
+COMPILED_PROGRAM_PATH = "compiled_pipeline.json"
+
+# Layout of a coding question's text, built once instead of on every call.
+# Placeholders are GenerateCodingQuestion output fields.
+CODING_QUESTION_TEMPLATE = (
+    "{question_title}\n\n{question_description}\n\n"
+    "Input: {input_format}\nOutput: {output_format}\n\n"
+    "Constraints: {constraints}\n\n"
+    "Example:\n{example}"
 )
 
+# Output field -> text preceding it in CODING_QUESTION_TEMPLATE, for streaming
+CODING_QUESTION_FIELDS = {
+    field: literal
+    for literal, field, _, _ in string.Formatter().parse(CODING_QUESTION_TEMPLATE)
+    if field
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _chain_of_thought(signature) -> dspy.ChainOfThought:
+    """Return the shared ChainOfThought for a signature, building it on first use."""
+    return dspy.ChainOfThought(signature)
+
 
 class QuestionGenerator(dspy.Module):
     """
@@ -27,7 +66,7 @@ class QuestionGenerator(dspy.Module):
     def __init__(self):
         super().__init__()
         # ChainOfThought makes the LLM explain its reasoning before answering
-        self.generate = dspy.ChainOfThought(GenerateQuestion)
+        self.generate = _chain_of_thought(GenerateQuestion)
 
     def forward(self, topic: str, question_type: str, difficulty: str):
         """Generate a question with the given parameters."""
@@ -38,26 +77,38 @@ class QuestionGenerator(dspy.Module):
         )
         return result
 
+    async def aforward(self, topic: str, question_type: str, difficulty: str):
+        """Asynchronous counterpart of forward()."""
+        return await self.generate.acall(
+            topic=topic,
+            question_type=question_type,
+            difficulty=difficulty
+        )
+
 
 class CodingQuestionGenerator(dspy.Module):
     """Specialized generator for coding/algorithm questions."""
 
     def __init__(self):
         super().__init__()
-        self.generate = dspy.ChainOfThought(GenerateCodingQuestion)
+        self.generate = _chain_of_thought(GenerateCodingQuestion)
 
     def forward(self, topic: str, difficulty: str):
         """Generate a structured coding question."""
         result = self.generate(topic=topic, difficulty=difficulty)
         return result
 
+    async def aforward(self, topic: str, difficulty: str):
+        """Asynchronous counterpart of forward()."""
+        return await self.generate.acall(topic=topic, difficulty=difficulty)
+
 
 class MLQuestionGenerator(dspy.Module):
     """Specialized generator for ML scientist interview questions."""
 
     def __init__(self):
         super().__init__()
-        self.generate = dspy.ChainOfThought(GenerateMLQuestion)
+        self.generate = _chain_of_thought(GenerateMLQuestion)
 
     def forward(self, topic: str, difficulty: str, question_style: str = "mixed"):
         """Generate an ML question."""
@@ -68,13 +119,21 @@ class MLQuestionGenerator(dspy.Module):
         )
         return result
 
+    async def aforward(self, topic: str, difficulty: str, question_style: str = "mixed"):
+        """Asynchronous counterpart of forward()."""
+        return await self.generate.acall(
+            topic=topic,
+            difficulty=difficulty,
+            question_style=question_style
+        )
+
 
 class FollowUpGenerator(dspy.Module):
     """Generates relevant follow-up questions."""
 
     def __init__(self):
         super().__init__()
-        self.generate = dspy.ChainOfThought(GenerateFollowUp)
+        self.generate = _chain_of_thought(GenerateFollowUp)
 
     def forward(self, original_question: str, topic: str, num_followups: int = 3):
         """Generate follow-up questions."""
@@ -85,6 +144,14 @@ class FollowUpGenerator(dspy.Module):
         )
         return result
 
+    async def aforward(self, original_question: str, topic: str, num_followups: int = 3):
+        """Asynchronous counterpart of forward()."""
+        return await self.generate.acall(
+            original_question=original_question,
+            topic=topic,
+            num_followups=num_followups
+        )
+
 
 class InterviewPipeline(dspy.Module):
     """
@@ -92,13 +159,17 @@ class InterviewPipeline(dspy.Module):
 
     This demonstrates DSPy's composability: we can chain multiple
     modules together to create complex workflows.
+
+    The question and its follow-ups come from a single fused LLM call
+    (GenerateQuestionWithFollowUps), so the shared prompt is only sent
+    once. Use FollowUpGenerator directly for follow-ups to a question
+    from elsewhere.
     """
 
     def __init__(self):
         super().__init__()
-        self.question_gen = QuestionGenerator()
-        self.followup_gen = FollowUpGenerator()
-        self.difficulty_assessor = dspy.ChainOfThought(AssessDifficulty)
+        self.question_followup_gen = _chain_of_thought(GenerateQuestionWithFollowUps)
+        self.difficulty_assessor = _chain_of_thought(AssessDifficulty)
 
     def forward(self, topic: str, question_type: str, difficulty: str, num_followups: int = 3):
         """
@@ -107,17 +178,11 @@ class InterviewPipeline(dspy.Module):
         Returns:
             dict with 'question', 'explanation', 'followups', and 'difficulty_check'
         """
-        # Generate main question
-        question_result = self.question_gen(
+        # Generate main question and follow-ups
+        question_result = self.question_followup_gen(
             topic=topic,
             question_type=question_type,
-            difficulty=difficulty
-        )
-
-        # Generate follow-ups
-        followup_result = self.followup_gen(
-            original_question=question_result.question,
-            topic=topic,
+            difficulty=difficulty,
             num_followups=num_followups
         )
 
@@ -127,13 +192,32 @@ class InterviewPipeline(dspy.Module):
             topic=topic
         )
 
+        return self._build_result(difficulty, question_result, difficulty_result)
+
+    async def aforward(self, topic: str, question_type: str, difficulty: str, num_followups: int = 3):
+        """Asynchronous counterpart of forward()."""
+        question_result = await self.question_followup_gen.acall(
+            topic=topic,
+            question_type=question_type,
+            difficulty=difficulty,
+            num_followups=num_followups
+        )
+        difficulty_result = await self.difficulty_assessor.acall(
+            question=question_result.question,
+            topic=topic
+        )
+        return self._build_result(difficulty, question_result, difficulty_result)
+
+    @staticmethod
+    def _build_result(difficulty: str, question_result, difficulty_result) -> Dict:
+        """Combine the two LLM results into the dict returned by forward()."""
         return {
             'question': question_result.question,
             'explanation': question_result.explanation,
             'requested_difficulty': difficulty,
             'assessed_difficulty': difficulty_result.assessed_difficulty,
             'difficulty_reasoning': difficulty_result.reasoning,
-            'followup_questions': followup_result.followup_questions
+            'followup_questions': question_result.followup_questions
         }
 
 
@@ -141,34 +225,148 @@ class CompleteInterviewGenerator(dspy.Module):
     """
     Advanced pipeline that can generate different types of questions
     with specialized generators.
+
+    Use batch() to generate several questions at once: the LLM calls
+    for all requests are issued concurrently instead of one by one.
+    Use astream() to show a single question while it is being generated.
+
+    Pass a DiskCacheBackend as cache to reuse results for requests
+    that were already generated, and additionally a SemanticCache to
+    reuse them for requests on near-identical topics.
+
+    If the program compiled by scripts/compile_pipeline.py exists at
+    compiled_path (and matches the current SIG_VERSION), its optimized
+    prompts are loaded. Pass compiled_path=None to use the plain modules.
+    Cached results are keyed on the loaded program and the configured LM,
+    so they are not served again after a recompile or a model change.
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[DiskCacheBackend] = None,
+                 semantic_cache: Optional[SemanticCache] = None,
+                 compiled_path: Optional[str] = COMPILED_PROGRAM_PATH):
         super().__init__()
+        if semantic_cache is not None and cache is None:
+            raise ValueError("semantic_cache requires cache, which stores the results")
         self.coding_gen = CodingQuestionGenerator()
         self.ml_gen = MLQuestionGenerator()
         self.followup_gen = FollowUpGenerator()
-
-    def forward(self, topic: str, question_type: str, difficulty: str, num_followups: int = 3):
-        """Generate appropriate question based on type."""
-
+        self.cache = cache
+        self.semantic_cache = semantic_cache
+
+        # compile_key of the loaded program (None for the plain modules)
+        self.compile_key = None
+        meta = self._current_compile_meta(compiled_path) if compiled_path is not None else None
+        if meta is not None:
+            # Load into private copies: the shared predictors stay plain
+            for module in (self.coding_gen, self.ml_gen, self.followup_gen):
+                module.generate = module.generate.deepcopy()
+            self.load(compiled_path)
+            self.compile_key = meta.get('compile_key')
+
+    @staticmethod
+    def _current_compile_meta(path: str) -> Optional[Dict]:
+        """
+        Return the compile_meta of the compiled program at path, or None if
+        there is none or it was not built from the current signatures.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            meta = json.load(f).get('compile_meta', {})
+        return meta if meta.get('sig_version') == SIG_VERSION else None
+
+    def _select_generator(self, question_type: str):
+        """Return the specialized generator and its extra arguments for a question type."""
         if question_type == "coding":
-            result = self.coding_gen(topic=topic, difficulty=difficulty)
-            main_question = f"{result.question_title}\n\n{result.question_description}\n\nInput: {result.input_format}\nOutput: {result.output_format}\n\nConstraints: {result.constraints}\n\nExample:\n{result.example}"
-
+            return self.coding_gen, {}
         elif question_type == "ml_theory":
-            ml_result = self.ml_gen(topic=topic, difficulty=difficulty, question_style="theoretical")
-            main_question = ml_result.question
-            result = ml_result
-
+            return self.ml_gen, {"question_style": "theoretical"}
         elif question_type == "ml_practical":
-            ml_result = self.ml_gen(topic=topic, difficulty=difficulty, question_style="practical")
-            main_question = ml_result.question
-            result = ml_result
-
+            return self.ml_gen, {"question_style": "practical"}
         else:
             raise ValueError(f"Unknown question type: {question_type}")
 
+    @staticmethod
+    def _format_question(question_type: str, result) -> str:
+        """Turn a specialized generator's output into the main question text."""
+        if question_type == "coding":
+            return CODING_QUESTION_TEMPLATE.format_map(result)
+        return result.question
+
+    @staticmethod
+    def _current_model() -> Optional[str]:
+        """
+        Name of the configured LM, which cached results are keyed on.
+
+        Call it on the thread that makes the LLM calls: with DSPy 2.6,
+        dspy.context() overrides are not visible from other threads.
+        """
+        lm = dspy.settings.lm
+        return lm.model if lm is not None else None
+
+    def _request_key(self, request: Dict, model: Optional[str]) -> str:
+        """Exact-match cache key of a request dict."""
+        return make_key(
+            request['topic'],
+            request['question_type'],
+            request['difficulty'],
+            request.get('num_followups', 3),
+            compile_key=self.compile_key,
+            model=model
+        )
+
+    def _cache_get(self, key: str) -> Optional[Dict]:
+        """Look up a result, rebuilding its 'details' Prediction."""
+        cached = self.cache.get(key)
+        if cached is None:
+            return None
+        return {**cached, 'details': dspy.Prediction(**cached['details'])}
+
+    def _lookup(self, requests: List[Dict], model: Optional[str]) -> List[Optional[Dict]]:
+        """Find cached results for requests: exact matches first, then similar topics."""
+        outputs = [self._cache_get(self._request_key(r, model)) for r in requests]
+
+        if self.semantic_cache is not None:
+            misses = [i for i, output in enumerate(outputs) if output is None]
+            similar_keys = self.semantic_cache.lookup(
+                [requests[i] for i in misses],
+                compile_key=self.compile_key,
+                model=model
+            )
+            for i, key in zip(misses, similar_keys):
+                if key is not None:
+                    outputs[i] = self._cache_get(key)
+        return outputs
+
+    def _store(self, requests: List[Dict], outputs: List[Dict], model: Optional[str]):
+        """Cache generated results; the Prediction is saved as a plain dict so it can be pickled."""
+        keys = [self._request_key(r, model) for r in requests]
+        for key, output in zip(keys, outputs):
+            self.cache.set(key, {**output, 'details': output['details'].toDict()})
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(
+                requests, keys, compile_key=self.compile_key, model=model
+            )
+
+    def forward(self, topic: str, question_type: str, difficulty: str, num_followups: int = 3):
+        """Generate appropriate question based on type."""
+        generator, extra_args = self._select_generator(question_type)
+        request = {
+            'topic': topic,
+            'question_type': question_type,
+            'difficulty': difficulty,
+            'num_followups': num_followups
+        }
+
+        model = self._current_model()
+        if self.cache is not None:
+            cached = self._lookup([request], model)[0]
+            if cached is not None:
+                return cached
+
+        result = generator(topic=topic, difficulty=difficulty, **extra_args)
+        main_question = self._format_question(question_type, result)
+
         # Generate follow-ups
         followup_result = self.followup_gen(
             original_question=main_question,
@@ -176,9 +374,221 @@ class CompleteInterviewGenerator(dspy.Module):
             num_followups=num_followups
         )
 
-        return {
+        output = {
             'question': main_question,
             'details': result,
             'difficulty': difficulty,
             'followup_questions': followup_result.followup_questions
         }
+        if self.cache is not None:
+            self._store([request], [output], model)
+        return output
+
+    async def aforward(self, topic: str, question_type: str, difficulty: str, num_followups: int = 3):
+        """Asynchronous counterpart of forward()."""
+        return (await self.abatch([{
+            'topic': topic,
+            'question_type': question_type,
+            'difficulty': difficulty,
+            'num_followups': num_followups
+        }]))[0]
+
+    async def abatch(self, requests: List[Dict], max_concurrency: int = 4) -> List[Dict]:
+        """
+        Generate several questions concurrently.
+
+        Each request is a dict with 'topic', 'question_type', 'difficulty'
+        and optionally 'num_followups' (default 3). All main questions are
+        generated in parallel, then all follow-ups. At most max_concurrency
+        LLM calls are in flight at once, to stay within provider rate limits.
+        Requests found in the cache are not sent to the LLM, and identical
+        requests in a batch are only generated once.
+
+        Returns:
+            list of result dicts (same format as forward()), in request order
+        """
+        # Validate every request before spending any tokens
+        for r in requests:
+            self._select_generator(r['question_type'])
+
+        if self.cache is None:
+            return await self._generate_batch(requests, max_concurrency)
+
+        # Cache access can call the (blocking) embedder, so it runs off the event loop
+        model = self._current_model()
+        outputs = await asyncio.to_thread(self._lookup, requests, model)
+        misses = [i for i, output in enumerate(outputs) if output is None]
+
+        generated = await self._generate_batch([requests[i] for i in misses], max_concurrency)
+        await asyncio.to_thread(self._store, [requests[i] for i in misses], generated, model)
+        for i, output in zip(misses, generated):
+            outputs[i] = output
+        return outputs
+
+    async def _generate_batch(self, requests: List[Dict], max_concurrency: int) -> List[Dict]:
+        """
+        Run the LLM calls for abatch(), bypassing the cache.
+
+        Identical requests are generated once and share both their main
+        question and follow-up calls. Requests are dispatched grouped by
+        (question_type, difficulty), the main drivers of prompt and
+        completion length, so that similar-length calls reach the provider
+        together (length bucketing) and share a prompt prefix. Results are
+        returned in the original order.
+        """
+        def request_tuple(r):
+            return (r['topic'], r['question_type'], r['difficulty'], r.get('num_followups', 3))
+
+        # Distinct requests in bucket order, and each request tuple's slot among them
+        buckets = collections.defaultdict(list)
+        for r in requests:
+            buckets[(r['question_type'], r['difficulty'])].append(r)
+        slots = {}
+        distinct = []
+        for r in (r for bucket in buckets.values() for r in bucket):
+            if request_tuple(r) not in slots:
+                slots[request_tuple(r)] = len(distinct)
+                distinct.append(r)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def call(module, **kwargs):
+            async with semaphore:
+                return await module.acall(**kwargs)
+
+        generators = [self._select_generator(r['question_type']) for r in distinct]
+
+        # Generate main questions
+        results = await asyncio.gather(*(
+            call(generator, topic=r['topic'], difficulty=r['difficulty'], **extra_args)
+            for r, (generator, extra_args) in zip(distinct, generators)
+        ))
+        main_questions = [
+            self._format_question(r['question_type'], result)
+            for r, result in zip(distinct, results)
+        ]
+
+        # Generate follow-ups for the completed main questions
+        followup_results = await asyncio.gather(*(
+            call(
+                self.followup_gen,
+                original_question=main_question,
+                topic=r['topic'],
+                num_followups=r.get('num_followups', 3)
+            )
+            for r, main_question in zip(distinct, main_questions)
+        ))
+
+        generated = [
+            {
+                'question': main_question,
+                'details': result,
+                'difficulty': r['difficulty'],
+                'followup_questions': followup_result.followup_questions
+            }
+            for r, main_question, result, followup_result
+            in zip(distinct, main_questions, results, followup_results)
+        ]
+        return [dict(generated[slots[request_tuple(r)]]) for r in requests]
+
+    async def astream(self, topic: str, question_type: str, difficulty: str, num_followups: int = 3):
+        """
+        Generate a question like aforward(), streaming the text as it arrives.
+
+        Yields (section, text) pairs, where section is 'question' or
+        'followup_questions', then the complete result dict. When the LM
+        does not stream (or the result is cached), each section is yielded
+        in one piece.
+        """
+        generator, extra_args = self._select_generator(question_type)
+        request = {
+            'topic': topic,
+            'question_type': question_type,
+            'difficulty': difficulty,
+            'num_followups': num_followups
+        }
+
+        model = self._current_model()
+        if self.cache is not None:
+            # Off the event loop, like in abatch()
+            cached = (await asyncio.to_thread(self._lookup, [request], model))[0]
+            if cached is not None:
+                yield 'question', cached['question']
+                yield 'followup_questions', cached['followup_questions']
+                yield cached
+                return
+
+        # Generate main question
+        fields = CODING_QUESTION_FIELDS if question_type == "coding" else {'question': ''}
+        streamed = False
+        async for value in self._stream_fields(
+            generator, fields, topic=topic, difficulty=difficulty, **extra_args
+        ):
+            if isinstance(value, dspy.Prediction):
+                result = value
+            else:
+                streamed = True
+                yield 'question', value
+        main_question = self._format_question(question_type, result)
+        if not streamed:
+            yield 'question', main_question
+
+        # Generate follow-ups
+        streamed = False
+        async for value in self._stream_fields(
+            self.followup_gen, {'followup_questions': ''},
+            original_question=main_question, topic=topic, num_followups=num_followups
+        ):
+            if isinstance(value, dspy.Prediction):
+                followup_result = value
+            else:
+                streamed = True
+                yield 'followup_questions', value
+        if not streamed:
+            yield 'followup_questions', followup_result.followup_questions
+
+        output = {
+            'question': main_question,
+            'details': result,
+            'difficulty': difficulty,
+            'followup_questions': followup_result.followup_questions
+        }
+        if self.cache is not None:
+            await asyncio.to_thread(self._store, [request], [output], model)
+        yield output
+
+    @staticmethod
+    async def _stream_fields(module, fields: Dict[str, str], **kwargs):
+        """
+        Run module, yielding text chunks of its output fields, then the Prediction.
+
+        fields maps each output field to stream (in generation order) to the
+        text printed before its first chunk.
+
+        DSPy's stream listeners only accept its built-in adapters (matched
+        by class name), so the call runs with a plain ChatAdapter instead
+        of the configured PrecompiledChatAdapter. Both render the same prompt.
+        """
+        listeners = [dspy.streaming.StreamListener(signature_field_name=field) for field in fields]
+        program = dspy.streamify(module, stream_listeners=listeners, is_async_program=True)
+
+        started = set()
+        with dspy.context(adapter=dspy.ChatAdapter()):
+            async for value in program(**kwargs):
+                if isinstance(value, dspy.streaming.StreamResponse):
+                    field, chunk = value.signature_field_name, value.chunk
+                    if field not in started:
+                        # Drop the whitespace between the field header and its value
+                        chunk = chunk.lstrip()
+                        if not chunk:
+                            continue
+                        started.add(field)
+                        if fields[field]:
+                            yield fields[field]
+                    yield chunk
+                elif isinstance(value, dspy.Prediction):
+                    yield value
+
+    def batch(self, requests: List[Dict], max_concurrency: int = 4) -> List[Dict]:
+        """Synchronous wrapper around abatch()."""
+        return asyncio.run(self.abatch(requests, max_concurrency=max_concurrency))
@@ -0,0 +1,248 @@
+"""
+Offline Generation through the OpenAI Batch API
+
+Bulk generation that can wait (building a question bank, for example)
+does not need real-time answers. The Batch API runs the same
+chat-completion requests within 24 hours at half the price.
+
+batch_offline() renders every request's prompt with the same adapter,
+signatures, compiled demos and sampling settings as the configured LM
+and submits them as one batch. collect() checks on it: once the main
+questions are done it submits their follow-ups as a second batch, and
+once those are done it returns the results. The state in between is
+kept on disk, so collect() can be called from a later process.
+"""
+
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+import dspy
+from openai import OpenAI
+
+from .cache import DiskCacheBackend
+from .config import PrecompiledChatAdapter
+from .modules import COMPILED_PROGRAM_PATH, CompleteInterviewGenerator
+
+# Batch states from which a batch will never complete
+FAILED_STATUSES = ('failed', 'expired', 'cancelling', 'cancelled')
+
+# dspy.LM kwargs that are chat-completion parameters, copied into each
+# batch request so offline results are sampled like online ones
+SAMPLING_KWARGS = (
+    'temperature', 'max_tokens', 'max_completion_tokens', 'top_p', 'n', 'stop',
+    'seed', 'presence_penalty', 'frequency_penalty', 'reasoning_effort'
+)
+
+
+def _job_key(batch_id: str) -> str:
+    """Store key of the job started by batch_offline()."""
+    return f"offline_job:{batch_id}"
+
+
+def _model_name(model: str) -> str:
+    """OpenAI model name for a LiteLLM model name ('openai/gpt-4o-mini' -> 'gpt-4o-mini')."""
+    return model.split('/', 1)[1] if model.startswith('openai/') else model
+
+
+def _submit(client: OpenAI, body: Dict, prompts: Dict[int, List[Dict]]) -> str:
+    """
+    Upload one chat-completion request per prompt and start a batch; returns its id.
+
+    body holds the parameters shared by every request (model, sampling
+    settings); prompts maps each request index to its messages.
+    """
+    lines = [
+        json.dumps({
+            'custom_id': str(i),
+            'method': 'POST',
+            'url': '/v1/chat/completions',
+            'body': {**body, 'messages': messages}
+        })
+        for i, messages in prompts.items()
+    ]
+    input_file = client.files.create(
+        file=('requests.jsonl', "\n".join(lines).encode('utf-8')),
+        purpose='batch'
+    )
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint='/v1/chat/completions',
+        completion_window='24h'
+    )
+    return batch.id
+
+
+def _fetch(client: OpenAI, batch_id: str, indices: List[int], wait: bool,
+           poll_interval: float) -> Optional[Tuple[Dict[int, str], Dict[int, str]]]:
+    """
+    Return the outcome of a finished batch as (completions, errors).
+
+    Both map request indices (out of indices) to the completion text or
+    to the reason the request failed. Returns None if the batch is still
+    running and wait is False. Raises RuntimeError if the whole batch failed.
+    """
+    batch = client.batches.retrieve(batch_id)
+    while batch.status != 'completed':
+        if batch.status in FAILED_STATUSES:
+            raise RuntimeError(f"Batch {batch_id} {batch.status}")
+        if not wait:
+            return None
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch_id)
+
+    completions, errors = {}, {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if file_id is None:
+            continue
+        for line in client.files.content(file_id).text.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            i = int(record['custom_id'])
+            response = record.get('response') or {}
+            if record.get('error') or response.get('status_code') != 200:
+                errors[i] = f"request failed: {record.get('error') or response.get('body')}"
+            else:
+                completions[i] = response['body']['choices'][0]['message']['content']
+
+    for i in indices:
+        if i not in completions and i not in errors:
+            errors[i] = "no result in batch output"
+    return completions, errors
+
+
+def _parse(adapter: dspy.Adapter, signature, completion: str) -> Dict:
+    """Parse a completion into output fields, raising ValueError if it is malformed."""
+    try:
+        return adapter.parse(signature, completion)
+    except Exception as e:
+        # The exception type raised for malformed output differs between DSPy versions
+        raise ValueError(f"could not parse completion: {e}") from e
+
+
+def batch_offline(requests: List[Dict], lm: Optional[dspy.LM] = None,
+                  store: Optional[DiskCacheBackend] = None,
+                  compiled_path: Optional[str] = COMPILED_PROGRAM_PATH) -> str:
+    """
+    Submit generation requests to the OpenAI Batch API.
+
+    Requests have the same format as for CompleteInterviewGenerator.batch().
+    The model and sampling settings are taken from lm (the LM set up by
+    configure_lm() when not given). The job is remembered in store (a
+    DiskCacheBackend in the default cache directory when not given) for collect().
+
+    Returns:
+        id of the submitted batch, to pass to collect()
+    """
+    lm = lm or dspy.settings.lm
+    if lm is None:
+        raise ValueError("No LM configured: call configure_lm() or pass lm")
+    body = {
+        'model': _model_name(lm.model),
+        **{k: v for k, v in lm.kwargs.items() if k in SAMPLING_KWARGS and v is not None}
+    }
+
+    generator = CompleteInterviewGenerator(compiled_path=compiled_path)
+    adapter = PrecompiledChatAdapter()
+
+    prompts = {}
+    for i, r in enumerate(requests):
+        module, extra_args = generator._select_generator(r['question_type'])
+        predictor = module.generate.predict
+        prompts[i] = adapter.format(
+            predictor.signature,
+            predictor.demos,
+            {'topic': r['topic'], 'difficulty': r['difficulty'], **extra_args}
+        )
+
+    batch_id = _submit(OpenAI(), body, prompts)
+    store = store or DiskCacheBackend()
+    store.set(_job_key(batch_id), {
+        'requests': requests,
+        'body': body,
+        'compiled_path': compiled_path,
+        'followup_batch_id': None
+    })
+    return batch_id
+
+
+def collect(batch_id: str, store: Optional[DiskCacheBackend] = None,
+            wait: bool = False, poll_interval: float = 60) -> Optional[List[Dict]]:
+    """
+    Collect the results of a job started by batch_offline().
+
+    When the main questions are done, their follow-ups are submitted as a
+    second batch. With wait=True, blocks (checking every poll_interval
+    seconds) until everything is done.
+
+    A request that failed (rejected by the API, or answered with output
+    that cannot be parsed) does not affect the others: its entry is a
+    dict with only an 'error' message.
+
+    Returns:
+        list of result dicts (same format as CompleteInterviewGenerator.forward()),
+        in request order, or None while the job is still running
+    """
+    store = store or DiskCacheBackend()
+    job = store.get(_job_key(batch_id))
+    if job is None:
+        raise ValueError(f"Unknown offline batch: {batch_id}")
+
+    client = OpenAI()
+    generator = CompleteInterviewGenerator(compiled_path=job['compiled_path'])
+    adapter = PrecompiledChatAdapter()
+    requests = job['requests']
+
+    fetched = _fetch(client, batch_id, list(range(len(requests))), wait, poll_interval)
+    if fetched is None:
+        return None
+    completions, errors = fetched
+
+    results, main_questions = {}, {}
+    for i, completion in completions.items():
+        r = requests[i]
+        module, _ = generator._select_generator(r['question_type'])
+        try:
+            results[i] = dspy.Prediction(**_parse(adapter, module.generate.predict.signature, completion))
+        except ValueError as e:
+            errors[i] = str(e)
+            continue
+        main_questions[i] = generator._format_question(r['question_type'], results[i])
+
+    # Generate follow-ups for the main questions that came back
+    followup_predictor = generator.followup_gen.generate.predict
+    if job['followup_batch_id'] is None and main_questions:
+        job['followup_batch_id'] = _submit(client, job['body'], {
+            i: adapter.format(followup_predictor.signature, followup_predictor.demos, {
+                'original_question': main_question,
+                'topic': requests[i]['topic'],
+                'num_followups': requests[i].get('num_followups', 3)
+            })
+            for i, main_question in main_questions.items()
+        })
+        store.set(_job_key(batch_id), job)
+
+    followups = {}
+    if main_questions:
+        fetched = _fetch(client, job['followup_batch_id'], list(main_questions), wait, poll_interval)
+        if fetched is None:
+            return None
+        followup_completions, followup_errors = fetched
+        errors.update(followup_errors)
+        for i, completion in followup_completions.items():
+            try:
+                followups[i] = _parse(adapter, followup_predictor.signature, completion)['followup_questions']
+            except ValueError as e:
+                errors[i] = str(e)
+
+    return [
+        {
+            'question': main_questions[i],
+            'details': results[i],
+            'difficulty': r['difficulty'],
+            'followup_questions': followups[i]
+        }
+        if i in followups else {'error': errors[i]}
+        for i, r in enumerate(requests)
+    ]
@@ -7,6 +7,17 @@ They're like type hints that declare what task we want to solve.
 
 import dspy
 
+# Version of the signatures below, used in result cache keys.
+# Bump it whenever a signature (docstring or fields) changes so that
+# results generated with the old prompts are no longer served.
+SIG_VERSION = 2
+
+# Input fields are rendered in declaration order after the static
+# instructions, so provider prompt caching can reuse the prefix up to the
+# first value that changes. Keep num_followups as the last input wherever
+# it appears: the other inputs do not depend on it, and the instructions
+# never mention a specific number.
+
 
 class GenerateQuestion(dspy.Signature):
     """Generate a technical interview question based on the topic and type."""
@@ -24,11 +35,26 @@ class GenerateFollowUp(dspy.Signature):
 
     original_question: str = dspy.InputField(desc="The original interview question")
     topic: str = dspy.InputField(desc="The topic area")
+    # Last input; see the note on field order above
     num_followups: int = dspy.InputField(desc="Number of follow-up questions to generate")
 
     followup_questions: str = dspy.OutputField(desc="List of follow-up questions, numbered")
 
 
+class GenerateQuestionWithFollowUps(dspy.Signature):
+    """Generate a technical interview question together with follow-up questions that build on it."""
+
+    topic: str = dspy.InputField(desc="The specific topic or technology (e.g., 'binary trees', 'neural networks')")
+    question_type: str = dspy.InputField(desc="Type of question: 'coding' or 'ml_theory'")
+    difficulty: str = dspy.InputField(desc="Difficulty level: 'easy', 'medium', or 'hard'")
+    # Last input; see the note on field order above
+    num_followups: int = dspy.InputField(desc="Number of follow-up questions to generate")
+
+    question: str = dspy.OutputField(desc="The generated interview question")
+    explanation: str = dspy.OutputField(desc="Brief explanation of what this question tests")
+    followup_questions: str = dspy.OutputField(desc="List of follow-up questions on the question above, numbered")
+
+
 class AssessDifficulty(dspy.Signature):
     """Assess and validate the difficulty level of a question."""
 
@@ -40,16 +66,34 @@ class AssessDifficulty(dspy.Signature):
 
 
 class GenerateCodingQuestion(dspy.Signature):
-    """Generate a coding/algorithm question with specific constraints."""
+    """Generate a coding/algorithm question with specific constraints.
+
+    Write the problem the way it would appear in a real technical interview:
+    - Title: a short, descriptive problem name (e.g. 'Kth Smallest Element in a BST').
+    - Description: a self-contained problem statement that names the data
+      structure involved and states exactly what must be computed.
+    - Input format: the parameters, their types and any guarantees about them.
+    - Output format: the return value and its type.
+    - Constraints: bounds on the input size and the expected time and space
+      complexity in Big-O notation.
+    - Example: at least one concrete input with its expected output, followed
+      by a one-line explanation.
+
+    Match the requested difficulty:
+    - easy: one standard technique, solvable in about 15 minutes.
+    - medium: combines two ideas or needs a non-obvious data structure.
+    - hard: needs an advanced technique (e.g. dynamic programming on graphs,
+      segment trees) or careful optimization to meet the constraints.
+    """
 
     topic: str = dspy.InputField(desc="Algorithm or data structure topic")
-    difficulty: str = dspy.InputField(desc="Difficulty level: 'easy', 'medium', or 'hard'")
+    difficulty: str = dspy.InputField(desc="'easy', 'medium', or 'hard'")
 
-    question_title: str = dspy.OutputField(desc="Concise title for the coding problem")
-    question_description: str = dspy.OutputField(desc="Detailed problem description")
-    input_format: str = dspy.OutputField(desc="Description of input format")
-    output_format: str = dspy.OutputField(desc="Description of expected output")
-    constraints: str = dspy.OutputField(desc="Time/space complexity constraints")
+    question_title: str = dspy.OutputField(desc="Problem title")
+    question_description: str = dspy.OutputField(desc="Problem statement")
+    input_format: str = dspy.OutputField(desc="Input format")
+    output_format: str = dspy.OutputField(desc="Output format")
+    constraints: str = dspy.OutputField(desc="Size and complexity constraints")
     example: str = dspy.OutputField(desc="Example input/output")
 
 